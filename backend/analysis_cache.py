@@ -0,0 +1,76 @@
+import json
+import os
+import re
+import threading
+from typing import Dict, Optional
+
+from config import settings
+from models import AgentAnalysisResponse
+
+
+class CacheMissError(LookupError):
+    """Raised by the replay backend when a query was not precomputed."""
+
+
+def normalize_query(user_request: str) -> str:
+    """Queries are matched case- and whitespace-insensitively."""
+    return re.sub(r"\s+", " ", user_request.strip().lower())
+
+
+class AnalysisCache:
+    """
+    File-backed cache of analysis responses for the mock profiles.
+
+    In mock mode the transactions are fixed per MOCK_USER_TYPE, so entries are
+    keyed by (profile, normalized query) and persisted to
+    `<ANALYSIS_CACHE_DIR>/<profile>_analysis.json`.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self._entries: Dict[str, Dict[str, dict]] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, profile: str) -> str:
+        return os.path.join(self.cache_dir, f"{profile}_analysis.json")
+
+    def _load(self, profile: str) -> Dict[str, dict]:
+        entries = self._entries.get(profile)
+        if entries is None:
+            path = self._path(profile)
+            entries = {}
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as file:
+                    entries = json.load(file).get("entries", {})
+            self._entries[profile] = entries
+        return entries
+
+    def exists(self, profile: str) -> bool:
+        return bool(self._entries.get(profile)) or os.path.exists(self._path(profile))
+
+    def get(self, profile: str, user_request: str) -> Optional[AgentAnalysisResponse]:
+        with self._lock:
+            entry = self._load(profile).get(normalize_query(user_request))
+        if entry is None:
+            return None
+        response = AgentAnalysisResponse(**entry)
+        response.userQuery = user_request
+        return response
+
+    def contains(self, profile: str, user_request: str) -> bool:
+        with self._lock:
+            return normalize_query(user_request) in self._load(profile)
+
+    def put(self, profile: str, user_request: str, response: AgentAnalysisResponse) -> None:
+        with self._lock:
+            entries = self._load(profile)
+            entries[normalize_query(user_request)] = response.model_dump()
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write to a temp file first so a crash never leaves a truncated cache
+            tmp_path = self._path(profile) + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump({"profile": profile, "entries": entries}, file, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self._path(profile))
+
+
+analysis_cache = AnalysisCache(settings.ANALYSIS_CACHE_DIR)
@@ -1,5 +1,4 @@
 from fastapi import APIRouter, HTTPException
-import requests
 from typing import List, Dict, Any
 import json
 from pathlib import Path
@@ -17,15 +16,21 @@ NESSIE_BASE_URL = "http://api.nessieisreal.com"
 use_mock = os.getenv("use_mock", "false").lower() == "true"
 USER_TYPE = os.getenv("MOCK_USER_TYPE", "good").lower()
 
+def resolve_mock_path(folder_name: str, file_name: str) -> Path:
+    """Ruta del mock: primero junto a este archivo, si no existe un nivel más arriba."""
+    base_path = Path(__file__).parent  # ruta actual
+    json_file_path = base_path / folder_name / file_name
+
+    # Si no lo encuentra en la misma carpeta, sube un nivel
+    if not json_file_path.exists():
+        json_file_path = base_path.parent / folder_name / file_name
+    return json_file_path
+
+
 def load_mock_json(folder_name: str, file_name: str) -> Dict[str, Any]:
     """Carga datos desde un archivo JSON local, con búsqueda flexible según estructura del proyecto."""
     try:
-        base_path = Path(__file__).parent  # ruta actual
-        json_file_path = base_path / folder_name / file_name
-
-        # Si no lo encuentra en la misma carpeta, sube un nivel
-        if not json_file_path.exists():
-            json_file_path = base_path.parent / folder_name / file_name
+        json_file_path = resolve_mock_path(folder_name, file_name)
 
         if not json_file_path.exists():
             raise HTTPException(status_code=404, detail=f"Archivo no encontrado: {json_file_path.resolve()}")
@@ -44,6 +49,8 @@ def load_mock_json(folder_name: str, file_name: str) -> Dict[str, Any]:
 
 def fetch_from_nessie(url: str) -> List[Dict[str, Any]]:
     """Hace una petición GET segura a la API de Nessie y devuelve lista."""
+    import requests  # Import diferido: en modo mock nunca se usa
+
     try:
         response = requests.get(url, timeout=10)
         response.raise_for_status()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the backend, based on `python -X importtime`.
+
+Each run imports the module in a fresh interpreter; the median total and the
+per-package self time are appended to a JSON-lines history file so cold-start
+regressions can be tracked across commits.
+
+Usage:
+    python bench_imports.py                       # import main, 5 runs
+    python bench_imports.py --max-regression 0.2  # exit 1 if >20% slower than the last record
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_HISTORY = os.path.join(BASE_DIR, "import_times.jsonl")
+
+
+def run_importtime(module: str) -> Tuple[float, Dict[str, float]]:
+    """Return (total ms, self ms per top-level package) for one cold import."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BASE_DIR, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    total_us = 0
+    packages: Dict[str, float] = defaultdict(float)
+    for line in result.stderr.splitlines():
+        # Format: "import time:   self [us] |  cumulative | imported package"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        packages[name.strip().split(".")[0]] += int(self_us) / 1000
+        if name.strip() == module and not name[1:].startswith(" "):
+            total_us = int(cumulative_us)
+    return total_us / 1000, packages
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def last_record(history_path: str, module: str) -> Optional[dict]:
+    if not os.path.exists(history_path):
+        return None
+    previous = None
+    with open(history_path, "r", encoding="utf-8") as file:
+        for line in file:
+            record = json.loads(line)
+            if record.get("module") == module and record.get("python") == platform.python_version():
+                previous = record
+    return previous
+
+
+def benchmark(module: str, runs: int, top: int) -> dict:
+    results: List[Tuple[float, Dict[str, float]]] = [run_importtime(module) for _ in range(runs)]
+    total_ms = statistics.median(total for total, _ in results)
+    packages = {
+        name: round(statistics.median(r[1].get(name, 0.0) for r in results), 1)
+        for name in results[0][1]
+    }
+    heaviest = dict(sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top])
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "module": module,
+        "runs": runs,
+        "total_ms": round(total_ms, 1),
+        "packages_ms": heaviest,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Track cold import time of the backend")
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Heaviest packages to record")
+    parser.add_argument("--history", default=DEFAULT_HISTORY)
+    parser.add_argument("--max-regression", type=float, default=None,
+                        help="Fail if total time grows more than this fraction vs the last record")
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args()
+
+    record = benchmark(args.module, args.runs, args.top)
+    previous = last_record(args.history, args.module)
+
+    print(f"import {record['module']}: {record['total_ms']} ms (median of {record['runs']} runs)")
+    for name, ms in record["packages_ms"].items():
+        print(f"  {name:<30} {ms:>8} ms")
+
+    regression = None
+    if previous and previous["total_ms"] > 0:
+        regression = (record["total_ms"] - previous["total_ms"]) / previous["total_ms"]
+        print(f"vs {previous.get('commit') or previous['timestamp']}: {previous['total_ms']} ms ({regression:+.0%})")
+
+    if not args.no_save:
+        with open(args.history, "a", encoding="utf-8") as file:
+            file.write(json.dumps(record) + "\n")
+
+    if args.max_regression is not None and regression is not None and regression > args.max_regression:
+        sys.exit(1)
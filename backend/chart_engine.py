@@ -0,0 +1,192 @@
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from insights import parse_transaction_date, transaction_amount
+
+
+CHART_TYPES = ("pie", "bar", "line", "area", "scatter")
+GROUPINGS = ("category", "description", "month", "date", "type", "account")
+METRICS = ("spending", "income", "net_flow", "balance", "count")
+
+# Groupings that form a time axis (required for the cumulative "balance" metric)
+TIME_GROUPINGS = ("month", "date")
+
+# Used when the LLM omits groupBy/metric for a chart type
+DEFAULT_SPECS: Dict[str, Tuple[str, str]] = {
+    "pie": ("category", "spending"),
+    "bar": ("month", "spending"),
+    "line": ("month", "net_flow"),
+    "area": ("date", "balance"),
+    "scatter": ("category", "spending"),
+}
+
+# Non-time groupings keep the biggest groups and fold the rest into "Other"
+MAX_CATEGORIES = 10
+OTHER_LABEL = "Other"
+
+# The keyword rules below are tuned to the bundled (Spanish) fixtures. When they leave
+# more than this share of the metric uncategorized, as with arbitrary live descriptions,
+# "category" falls back to the next grouping in CATEGORY_FALLBACKS that does better.
+CATEGORY_FALLBACK_SHARE = 0.5
+CATEGORY_FALLBACKS = ("description", "type")
+
+# Spending category from keywords in the (accent-stripped, lowercase) description.
+# First match wins, so more specific rules go first.
+CATEGORY_RULES: List[Tuple[str, str]] = [
+    ("Income", r"\bnomina\b"),
+    ("Debt payments", r"\btarjeta de credito\b|\bprestamo\b|\bhipoteca\b|\bpago mensual de auto\b"),
+    ("Savings & investments", r"\binversion\b|\bahorro\b|\bfondo de retiro\b|\bportafolio\b|\bcripto\b|\bjoyeria de inversion\b"),
+    ("Groceries", r"\bsupermercado\b|\btienda gourmet\b|\btienda de conveniencia\b"),
+    ("Dining", r"\brestaurante|\bcena\b|\bcomida\b|\bcafeteria\b|\buber eats\b"),
+    ("Bars & nightlife", r"\bbar(es)?\b|\bcervec|\bclubes\b|\bcopas\b|\bvinos\b|\blicores\b"),
+    ("Travel", r"\bviaje\b|\bhotel\b|\bprimera clase\b|\bvacaciones\b|\bresort\b|\bavion\b|\bautobus\b"),
+    ("Transport", r"\bgasolin|\btransporte\b|\bvalet\b|\bseguro de auto\b"),
+    ("Housing & utilities", r"\brenta\b|\bagua\b|\belectricidad\b|\binternet\b|\bcondominio\b|\bjardineria\b|\blimpieza\b|\binteriores\b"),
+    ("Subscriptions", r"\bsuscripci|\bstreaming\b|\bmembresia\b|\bservicios digitales\b|\bvideojuegos\b"),
+    ("Entertainment", r"\bentretenimiento\b|\bconcierto\b|\bteatro\b|\bpelicula\b|\bocio\b"),
+    ("Health & wellness", r"\bspa\b|\byoga\b|\bgimnasio\b|\bpeluqueria\b"),
+    ("Education & professional", r"\bcurso\b|\bclase\b|\bconsultoria\b|\bprofesional\b"),
+    ("Shopping", r"\btienda\b|\bropa\b|\bzapat|\baccesorios\b|\bmoda\b|\bregalo|\belectronic|\bgadget\b|\bcomputo\b|\barte\b|\bcompra\b"),
+    ("Cash withdrawals", r"\bretiro\b|\befectivo\b|\bcajero\b"),
+]
+_CATEGORY_PATTERNS = [(name, re.compile(pattern)) for name, pattern in CATEGORY_RULES]
+
+
+def categorize(description: str) -> str:
+    """Map a free-text transaction description to a spending category."""
+    text = unicodedata.normalize("NFKD", description or "").encode("ascii", "ignore").decode().lower()
+    for name, pattern in _CATEGORY_PATTERNS:
+        if pattern.search(text):
+            return name
+    return OTHER_LABEL
+
+
+def _group_key(tx: Dict[str, Any], group_by: str) -> Optional[str]:
+    if group_by in TIME_GROUPINGS:
+        tx_date = parse_transaction_date(tx.get("transaction_date"))
+        if tx_date is None:
+            return None
+        return tx_date.strftime("%Y-%m") if group_by == "month" else tx_date.isoformat()
+    if group_by == "category":
+        return categorize(tx.get("description") or "")
+    if group_by == "description":
+        return (tx.get("description") or "").strip() or OTHER_LABEL
+    if group_by == "type":
+        return tx.get("type") or OTHER_LABEL
+    return tx.get("nickname") or tx.get("account_type") or OTHER_LABEL
+
+
+def _metric_value(tx: Dict[str, Any], metric: str) -> Optional[float]:
+    """Contribution of a transaction to the metric, or None if it does not count."""
+    positive = bool(tx.get("positive"))
+    amount = transaction_amount(tx)
+    if metric == "spending":
+        return None if positive else amount
+    if metric == "income":
+        return amount if positive else None
+    if metric == "count":
+        return 1.0
+    # net_flow and balance
+    return amount if positive else -amount
+
+
+def _other_share(rows: List[Tuple[str, float, int]]) -> float:
+    magnitude = sum(abs(total) for _, total, _ in rows)
+    other = sum(abs(total) for label, total, _ in rows if label == OTHER_LABEL)
+    return other / magnitude if magnitude else 0.0
+
+
+def _aggregate(transactions: List[Dict[str, Any]], group_by: str, metric: str) -> List[Tuple[str, float, int]]:
+    """(label, total, count) per group, folding small groups into "Other" for non-time groupings."""
+    rows = _group_totals(transactions, group_by, metric)
+    if group_by == "category":
+        for fallback in CATEGORY_FALLBACKS:
+            if _other_share(rows) <= CATEGORY_FALLBACK_SHARE:
+                break
+            candidate = _group_totals(transactions, fallback, metric)
+            if _other_share(candidate) < _other_share(rows):
+                rows = candidate
+
+    if group_by in TIME_GROUPINGS:
+        return rows
+    rows.sort(key=lambda r: r[1], reverse=True)
+    if len(rows) > MAX_CATEGORIES:
+        rest = rows[MAX_CATEGORIES - 1:]
+        rows = rows[:MAX_CATEGORIES - 1] + [
+            (OTHER_LABEL, sum(r[1] for r in rest), sum(r[2] for r in rest))
+        ]
+    return rows
+
+
+def _group_totals(transactions: List[Dict[str, Any]], group_by: str, metric: str) -> List[Tuple[str, float, int]]:
+    """Single pass over the transactions returning (label, total, count) per group."""
+    totals: Dict[str, float] = defaultdict(float)
+    counts: Dict[str, int] = defaultdict(int)
+    for tx in transactions:
+        value = _metric_value(tx, metric)
+        if value is None:
+            continue
+        key = _group_key(tx, group_by)
+        if key is None:
+            continue
+        totals[key] += value
+        counts[key] += 1
+
+    if group_by in TIME_GROUPINGS:
+        rows = [(key, totals[key], counts[key]) for key in sorted(totals)]
+        if metric == "balance":
+            running = 0.0
+            cumulative = []
+            for key, total, count in rows:
+                running += total
+                cumulative.append((key, running, count))
+            rows = cumulative
+        return rows
+    return [(key, totals[key], counts[key]) for key in totals]
+
+
+def build_chart_data(
+    chart_type: str,
+    transactions: List[Dict[str, Any]],
+    group_by: Optional[str] = None,
+    metric: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Compute the `Graph.data` payload for a chart spec directly from the transactions:
+    - pie: [{"name": label, "value": total}]
+    - line/bar/area: [{group_by: label, "amount"|"count": total}]
+    - scatter: [{"name": label, "x": transaction count, "y": total}]
+
+    Raises ValueError for unsupported chart types, groupings or metrics.
+    """
+    if chart_type not in CHART_TYPES:
+        raise ValueError(f"Unsupported chart type: {chart_type}")
+    default_group_by, default_metric = DEFAULT_SPECS[chart_type]
+    group_by = group_by or default_group_by
+    metric = metric or default_metric
+    if group_by not in GROUPINGS:
+        raise ValueError(f"Unsupported groupBy: {group_by}")
+    if metric not in METRICS:
+        raise ValueError(f"Unsupported metric: {metric}")
+    if metric == "balance" and group_by not in TIME_GROUPINGS:
+        raise ValueError("The balance metric requires a month or date grouping")
+
+    rows = [
+        (label, int(total) if metric == "count" else round(total, 2), count)
+        for label, total, count in _aggregate(transactions or [], group_by, metric)
+    ]
+    value_key = "count" if metric == "count" else "amount"
+
+    if chart_type == "pie":
+        # Pie slices must be positive
+        data = [{"name": label, "value": total} for label, total, _ in rows if total > 0]
+        return {"data": data, "xAxisKey": "name", "yAxisKey": "value"}
+
+    if chart_type == "scatter":
+        data = [{"name": label, "x": count, "y": total} for label, total, count in rows]
+        return {"data": data, "xAxisKey": "transactions", "yAxisKey": value_key}
+
+    data = [{group_by: label, value_key: total} for label, total, _ in rows]
+    return {"data": data, "xAxisKey": group_by, "yAxisKey": value_key}
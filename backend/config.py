@@ -1,9 +1,37 @@
+import math
 import os
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Used for "default" when RATE_LIMITS leaves it out: 120 requests per minute, burst of 30
+DEFAULT_RATE_LIMIT = (120.0, 30.0)
+
+
+def parse_rate_limits(spec: str) -> dict:
+    """
+    Parse "route=requests_per_minute/burst,..." into {route: (per_minute, burst)}.
+    Raises ValueError on malformed entries so a bad setting fails at startup.
+    """
+    limits = {"default": DEFAULT_RATE_LIMIT}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        route, _, limit = item.partition("=")
+        try:
+            per_minute, burst = (float(n) for n in limit.split("/"))
+        except ValueError:
+            per_minute = burst = math.nan
+        # Written as "not (valid)" so NaN fails too
+        if not route.strip() or not (0 < per_minute < math.inf and 1 <= burst < math.inf):
+            raise ValueError(
+                f"Invalid RATE_LIMITS entry '{item.strip()}', expected route=requests_per_minute/burst"
+            )
+        limits[route.strip()] = (per_minute, burst)
+    return limits
+
+
 class Settings:
     # API Configuration
     API_TITLE: str = "HackMIT 2025 Backend API"
@@ -23,5 +51,51 @@ class Settings:
         "http://127.0.0.1:5173"
     ]
 
+    # Limits for posted transaction payloads (/api/generate-analysis, /api/insights)
+    MAX_BODY_BYTES: int = int(os.getenv("MAX_BODY_BYTES", str(10 * 1024 * 1024)))
+    MAX_TRANSACTIONS: int = int(os.getenv("MAX_TRANSACTIONS", "50000"))
+
+    # Per-client, per-route token buckets: "route=requests_per_minute/burst,..."
+    # ("default" applies to every route without its own entry)
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "True").lower() == "true"
+    RATE_LIMITS: dict = parse_rate_limits(os.getenv(
+        "RATE_LIMITS",
+        "default=120/30,"
+        "/api/generate-analysis=10/3,"
+        "/api/transactions=30/10,"
+        "/api/loans=30/10,"
+        "/api/credit-score=30/10,"
+        "/api/loans-credit-summary=30/10",
+    ))
+    RATE_LIMIT_EXEMPT: list = ["/", "/api/health", "/api/ready"]
+    # Use the last X-Forwarded-For hop as the client (only behind a trusted proxy that sets it)
+    TRUST_FORWARDED_FOR: bool = os.getenv("TRUST_FORWARDED_FOR", "False").lower() == "true"
+
+    # Collapse concurrent identical GET requests into a single execution
+    COALESCE_GET_REQUESTS: bool = os.getenv("COALESCE_GET_REQUESTS", "True").lower() == "true"
+
+    # Analysis backend: "live" (always Gemini), "cached" (warm cache first, then Gemini)
+    # or "replay" (warm cache only, no network access)
+    ANALYSIS_BACKEND: str = os.getenv("ANALYSIS_BACKEND", "cached").lower()
+    ANALYSIS_CACHE_DIR: str = os.getenv(
+        "ANALYSIS_CACHE_DIR", os.path.join(os.path.dirname(__file__), "analysis-cache")
+    )
+
+    # Warmup of the analysis cache for mock profiles
+    WARMUP_ON_STARTUP: bool = os.getenv("WARMUP_ON_STARTUP", "False").lower() == "true"
+    WARMUP_PROFILES: list = [
+        p.strip().lower() for p in os.getenv("WARMUP_PROFILES", "good,medium,bad").split(",") if p.strip()
+    ]
+    WARMUP_QUERIES: list = [
+        q.strip() for q in os.getenv(
+            "WARMUP_QUERIES",
+            "analyze my spending patterns and show me where I can save money;"
+            "how can I improve my credit score;"
+            "show me my spending by category;"
+            "how has my balance changed over time;"
+            "what are my recurring payments",
+        ).split(";") if q.strip()
+    ]
+
 # Create settings instance
 settings = Settings()
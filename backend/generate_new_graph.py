@@ -2,13 +2,30 @@ import os
 import json
 from typing import Any, Dict, List, Optional
 
+from fastapi.concurrency import run_in_threadpool
 from pydantic import ValidationError
 from models import GraphBase, AgentAnalysisResponse
+from insights import build_insights, format_insights_for_prompt
+from chart_engine import build_chart_data
+from analysis_cache import CacheMissError, analysis_cache
+from api import use_mock, USER_TYPE
+from config import settings
 
-try:
-    import google.generativeai as genai
-except ImportError:  # pragma: no cover
-    genai = None  # We will validate at runtime
+# google.generativeai pulls in grpc/protobuf, so it is only imported on the first LLM call
+genai = None
+
+
+def _load_genai():
+    global genai
+    if genai is None:
+        try:
+            import google.generativeai as genai_module
+        except ImportError:
+            raise RuntimeError(
+                "The 'google-generativeai' package is not installed. Please add it to requirements.txt"
+            )
+        genai = genai_module
+    return genai
 
 
 ANALYSIS_PROMPT_PREAMBLE = (
@@ -29,22 +46,24 @@ Chart object format (when included):
 {
   "type": "line|bar|pie|area|scatter",
   "title": "Human readable chart title",
-  "data": [
-    // For pie charts: [{"name": "Category A", "value": 100}, {"name": "Category B", "value": 200}]
-    // For line/bar/area charts: [{"month": "Jan", "amount": 100}, {"month": "Feb", "amount": 200}]
-    // For scatter charts: [{"x": 10, "y": 20}, {"x": 15, "y": 25}]
-  ],
-  "xAxisKey": "month",  // Key for x-axis (line/bar/area charts)
-  "yAxisKey": "amount", // Key for y-axis (line/bar/area charts)
+  "groupBy": "category|description|month|date|type|account",  // How transactions are grouped on the x-axis / slices
+  "metric": "spending|income|net_flow|balance|count",  // What is summed per group
   "justification": "Why this chart type was chosen"
 }
 
+Do NOT include chart data values: the server computes them exactly from the full transaction history.
+Grouping and metric meanings:
+- "category": spending category derived from the description (Groceries, Dining, Transport, Shopping, Travel, ...); when most descriptions match no category, the slices are the descriptions or transaction types instead
+- "description": the raw transaction description (e.g. top merchants), "type": deposit/purchase/withdrawal/loan, "account": per account
+- "month" / "date": time series
+- "net_flow": income minus spending, "balance": running net flow over time (only with "month" or "date")
+
 Supported Chart Types:
 - "pie": For categorical data showing proportions
 - "bar": For comparing values across categories
 - "line": For showing trends over time or continuous data
 - "area": For showing cumulative data or filled line charts
-- "scatter": For showing relationships between two variables
+- "scatter": For showing relationships between two variables (number of transactions vs total per group)
 
 Analysis Requirements:
 - Write directly to the user as if in a personal conversation - no meta-references or treating this as a conversation
@@ -72,13 +91,16 @@ Set chart to null if no visualization adds value to the analysis.
 
 def _build_analysis_prompt(user_request: str, transaction_data: List[Dict[str, Any]]) -> str:
     # Include sample of actual transaction data in the prompt
-    sample_data = json.dumps(transaction_data[:10], indent=2) if transaction_data else "[]"
+    sample_data = json.dumps([dict(tx) for tx in transaction_data[:10]], indent=2) if transaction_data else "[]"
+    # Deterministic insights computed over the full history, not just the sample
+    insights_text = format_insights_for_prompt(build_insights(transaction_data))
 
     return (
         f"{ANALYSIS_PROMPT_PREAMBLE}\n\n"
         f"User request: {user_request}\n\n"
         f"Your transaction data sample (first 10 transactions - use this to understand their spending patterns):\n{sample_data}\n\n"
         f"Total transactions available: {len(transaction_data) if transaction_data else 0}\n\n"
+        f"Precomputed insights over the full transaction history (exact values, prefer these over estimates):\n{insights_text}\n\n"
         f"Analyze their specific financial behavior and provide personalized insights based on their actual transaction history.\n\n"
         f"{ANALYSIS_SCHEMA_INSTRUCTIONS}\n\n"
         "CRITICAL: Return responses in PLAIN TEXT ONLY. Absolutely NO asterisks (*), NO markdown, NO special formatting characters. Use line breaks and paragraphs for separation. Analysis should be simple and clear. Chart justifications should be very short as specified."
@@ -99,16 +121,16 @@ def extract_json(text: str) -> Optional[str]:
                 return text[start:i+1]
     return None
 
-def call_gemini_analysis(prompt: str, user_request: str) -> AgentAnalysisResponse:
+def call_gemini_analysis(
+    prompt: str,
+    user_request: str,
+    transaction_data: Optional[List[Dict[str, Any]]] = None,
+) -> AgentAnalysisResponse:
     api_key = os.getenv("GOOGLE_AI_API_KEY")
     if not api_key:
         raise RuntimeError("GOOGLE_AI_API_KEY is not set")
 
-    if genai is None:
-        raise RuntimeError(
-            "The 'google-generativeai' package is not installed. Please add it to requirements.txt"
-        )
-
+    genai = _load_genai()
     genai.configure(api_key=api_key)
     model = genai.GenerativeModel('gemini-2.5-flash')
     response = model.generate_content(prompt)
@@ -190,18 +212,30 @@ def call_gemini_analysis(prompt: str, user_request: str) -> AgentAnalysisRespons
             from models import Graph
             import uuid
             chart_data = data["chart"]
-            chart = Graph(
-                id=str(uuid.uuid4()),
-                type=chart_data["type"],
-                title=chart_data["title"],
-                data={
-                    "data": chart_data["data"],
-                    "xAxisKey": chart_data.get("xAxisKey"),
-                    "yAxisKey": chart_data.get("yAxisKey")
-                },
-                extra={},
-                justification=chart_data.get("justification", "")
-            )
+            # The LLM only picks the chart spec; values are computed from the transactions
+            try:
+                graph_data = build_chart_data(
+                    chart_data["type"],
+                    transaction_data or [],
+                    group_by=chart_data.get("groupBy"),
+                    metric=chart_data.get("metric"),
+                )
+            except ValueError:
+                graph_data = None
+            if graph_data and graph_data["data"]:
+                chart = Graph(
+                    id=str(uuid.uuid4()),
+                    type=chart_data["type"],
+                    title=chart_data["title"],
+                    data=graph_data,
+                    extra={
+                        "groupBy": chart_data.get("groupBy"),
+                        "metric": chart_data.get("metric"),
+                    },
+                    justification=chart_data.get("justification", "")
+                )
+            else:
+                chart = None
         else:
             chart = None
 
@@ -216,6 +250,11 @@ def call_gemini_analysis(prompt: str, user_request: str) -> AgentAnalysisRespons
     return analysis_response
 
 
+def _run_live_analysis(user_request: str, transaction_data: List[Dict[str, Any]]) -> AgentAnalysisResponse:
+    prompt = _build_analysis_prompt(user_request, transaction_data)
+    return call_gemini_analysis(prompt, user_request, transaction_data)
+
+
 async def generate_financial_analysis(
     user_request: str,
     transaction_data: List[Dict[str, Any]] = None,
@@ -229,5 +268,14 @@ async def generate_financial_analysis(
     if transaction_data is None:
         transaction_data = []
 
-    prompt = _build_analysis_prompt(user_request, transaction_data)
-    return call_gemini_analysis(prompt, user_request)
\ No newline at end of file
+    # Mock profiles have fixed data, so precomputed responses can be served as-is
+    replay = settings.ANALYSIS_BACKEND == "replay"
+    if replay or (settings.ANALYSIS_BACKEND == "cached" and use_mock):
+        cached = analysis_cache.get(USER_TYPE, user_request)
+        if cached is not None:
+            return cached
+    if replay:
+        raise CacheMissError(f"No precomputed analysis for profile '{USER_TYPE}' and request '{user_request}'")
+
+    # The insights pass over the transactions and the Gemini SDK call are both blocking
+    return await run_in_threadpool(_run_live_analysis, user_request, transaction_data)
\ No newline at end of file
@@ -0,0 +1,274 @@
+import codecs
+import json
+import sys
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+
+from config import settings
+from models import TransactionRecord
+
+
+# A single transaction (or other top-level value) larger than this is rejected
+MAX_RECORD_CHARS = 64 * 1024
+# Consumed input is dropped from the parse buffer once it grows past this
+BUFFER_COMPACT_CHARS = 64 * 1024
+# Body bytes collected before a parse step is handed to the threadpool
+PARSE_BATCH_BYTES = 1024 * 1024
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789.eE+-"
+_ROW_FIELDS = ("amount", "positive", "description", "transaction_date", "type", "account_type", "nickname")
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value is not None else None
+
+
+class PayloadTooLargeError(ValueError):
+    """Body size or record count over the configured limits."""
+
+
+class TransactionRow(Mapping):
+    """
+    One posted transaction reduced to the fields the analytics use. Slots instead
+    of a per-row dict keep 50k rows at about a third of the memory; as a
+    read-only Mapping it still works with tx.get(...) and dict(tx).
+    Missing (None) fields are left out, as in the JSON that was posted.
+    """
+
+    __slots__ = _ROW_FIELDS
+
+    def __init__(self, record: TransactionRecord):
+        self.amount = record.amount
+        self.positive = record.positive
+        # Interning collapses the many repeated descriptions/types/dates into one string each
+        self.description = sys.intern(record.description or "")
+        self.transaction_date = _intern(record.transaction_date)
+        self.type = _intern(record.type)
+        self.account_type = _intern(record.account_type)
+        self.nickname = _intern(record.nickname)
+
+    def get(self, key, default=None):
+        value = getattr(self, key) if key in _ROW_FIELDS else None
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self):
+        return (key for key in _ROW_FIELDS if getattr(self, key) is not None)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"TransactionRow({dict(self)!r})"
+
+
+class TransactionCollector:
+    """
+    Validates posted transactions one at a time and keeps each as a compact
+    TransactionRow, so the raw parsed dicts are dropped as soon as they are read.
+    The rows themselves are kept because insights and charts need the full history.
+    """
+
+    def __init__(self, max_transactions: int):
+        self.max_transactions = max_transactions
+        self.transactions: List[TransactionRow] = []
+
+    def add(self, raw: Any) -> None:
+        if len(self.transactions) >= self.max_transactions:
+            raise PayloadTooLargeError(f"More than {self.max_transactions} transactions")
+        if not isinstance(raw, dict):
+            raise ValueError("Each transaction must be a JSON object")
+        self.transactions.append(TransactionRow(TransactionRecord.model_validate(raw)))
+
+
+class TransactionStreamParser:
+    """
+    Incremental push parser for bodies shaped like
+    { "request": "...", "transactions": [ {...}, {...} ] }.
+
+    Top-level fields other than "transactions" are kept in `fields`; each element
+    of the transactions array is handed to `on_transaction` as soon as it is
+    complete, so the array is never materialized as a whole.
+    """
+
+    def __init__(self, on_transaction: Callable[[Any], None]):
+        self.fields: Dict[str, Any] = {}
+        self.has_transactions = False
+        self._on_transaction = on_transaction
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._state = "start"
+        self._key = None
+
+    def feed(self, text: str) -> None:
+        self._buffer += text
+        self._parse(final=False)
+        if self._pos > BUFFER_COMPACT_CHARS:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        if len(self._buffer) - self._pos > MAX_RECORD_CHARS:
+            raise ValueError(f"JSON value larger than {MAX_RECORD_CHARS} characters or malformed")
+
+    def close(self) -> None:
+        self._parse(final=True)
+        if self._state != "done":
+            raise ValueError("Truncated JSON body")
+
+    def _skip_whitespace(self) -> bool:
+        """Advance past whitespace; False if the buffer is exhausted."""
+        while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+            self._pos += 1
+        return self._pos < len(self._buffer)
+
+    def _expect(self, char: str) -> None:
+        if self._buffer[self._pos] != char:
+            raise ValueError(f"Expected '{char}' at position {self._pos}")
+        self._pos += 1
+
+    def _decode_value(self, final: bool):
+        """Decode one complete JSON value, or return (False, None) if more input is needed."""
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError as e:
+            if final:
+                raise ValueError(f"Invalid JSON: {e}")
+            return False, None
+        # A number is only complete once a delimiter follows it ("-0" may continue as "-0.5")
+        if not final and (end == len(self._buffer) or self._buffer[end] in _NUMBER_CHARS):
+            return False, None
+        self._pos = end
+        return True, value
+
+    def _parse(self, final: bool) -> None:
+        while self._skip_whitespace():
+            char = self._buffer[self._pos]
+            state = self._state
+
+            if state == "start":
+                self._expect("{")
+                self._state = "first_key"
+            elif state in ("first_key", "key"):
+                if state == "first_key" and char == "}":
+                    self._pos += 1
+                    self._state = "done"
+                    continue
+                done, key = self._decode_value(final)
+                if not done:
+                    return
+                if not isinstance(key, str):
+                    raise ValueError("Object keys must be strings")
+                self._key = key
+                self._state = "colon"
+            elif state == "colon":
+                self._expect(":")
+                self._state = "array_start" if self._key == "transactions" else "value"
+            elif state == "value":
+                done, value = self._decode_value(final)
+                if not done:
+                    return
+                self.fields[self._key] = value
+                self._state = "after_value"
+            elif state == "array_start":
+                self.has_transactions = True
+                if char == "[":
+                    self._pos += 1
+                    self._state = "first_item"
+                    continue
+                done, value = self._decode_value(final)
+                if not done:
+                    return
+                if value is not None:
+                    raise ValueError("'transactions' must be a list")
+                # null counts as missing, like an absent key
+                self.has_transactions = False
+                self._state = "after_value"
+            elif state in ("first_item", "item"):
+                if state == "first_item" and char == "]":
+                    self._pos += 1
+                    self._state = "after_value"
+                    continue
+                done, value = self._decode_value(final)
+                if not done:
+                    return
+                self._on_transaction(value)
+                self._state = "item_separator"
+            elif state == "item_separator":
+                if char == "]":
+                    self._state = "after_value"
+                else:
+                    self._expect(",")
+                    self._state = "item"
+                    continue
+                self._pos += 1
+            elif state == "after_value":
+                if char == "}":
+                    self._state = "done"
+                else:
+                    self._expect(",")
+                    self._state = "key"
+                    continue
+                self._pos += 1
+            else:  # done
+                raise ValueError("Unexpected data after the JSON body")
+
+
+class IngestedPayload(NamedTuple):
+    fields: Dict[str, Any]
+    transactions: List[TransactionRow]
+    has_transactions: bool
+
+
+async def ingest_transaction_payload(request: Request) -> IngestedPayload:
+    """
+    Stream the request body through the incremental parser, enforcing
+    settings.MAX_BODY_BYTES and settings.MAX_TRANSACTIONS.
+
+    Parsing is CPU-bound (roughly 40 ms per MB of body), so it runs in the threadpool in
+    PARSE_BATCH_BYTES batches and the event loop keeps serving other requests.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.MAX_BODY_BYTES:
+        raise HTTPException(status_code=413, detail=f"Body larger than {settings.MAX_BODY_BYTES} bytes")
+
+    collector = TransactionCollector(settings.MAX_TRANSACTIONS)
+    parser = TransactionStreamParser(collector.add)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    received = 0
+    pending: List[bytes] = []
+    pending_bytes = 0
+
+    def feed_pending(final: bool = False) -> None:
+        parser.feed(decoder.decode(b"".join(pending), final=final))
+        if final:
+            parser.close()
+
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > settings.MAX_BODY_BYTES:
+                raise PayloadTooLargeError(f"Body larger than {settings.MAX_BODY_BYTES} bytes")
+            pending.append(chunk)
+            pending_bytes += len(chunk)
+            if pending_bytes >= PARSE_BATCH_BYTES:
+                await run_in_threadpool(feed_pending)
+                pending, pending_bytes = [], 0
+        await run_in_threadpool(feed_pending, True)
+    except PayloadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid transaction: {e.errors()[0]}")
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=f"Malformed JSON body: {e}")
+
+    return IngestedPayload(parser.fields, collector.transactions, parser.has_transactions)
@@ -0,0 +1,216 @@
+from collections import defaultdict, deque
+from datetime import date, datetime, timedelta
+from math import sqrt
+from statistics import median
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from models import InsightsResponse, RecurringPayment, SpendingSpike, TransactionOutlier
+
+
+# Recurring payments: (cadence, min interval days, max interval days)
+CADENCES: List[Tuple[str, int, int]] = [
+    ("weekly", 6, 8),
+    ("biweekly", 12, 17),
+    ("monthly", 26, 35),
+]
+RECURRING_MIN_OCCURRENCES = 3
+RECURRING_MAX_AMOUNT_CV = 0.25  # Max coefficient of variation for "same amount"
+
+# Month-over-month spikes
+SPIKE_BASELINE_MONTHS = 3
+SPIKE_THRESHOLD = 0.30  # 30% above the rolling baseline
+
+# Outliers over a rolling window of previous outflows
+OUTLIER_WINDOW = 30
+OUTLIER_MIN_HISTORY = 5
+OUTLIER_Z_SCORE = 2.5
+
+
+def parse_transaction_date(value: Any) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value)[:10]).date()
+    except ValueError:
+        return None
+
+
+def transaction_amount(tx: Dict[str, Any]) -> float:
+    try:
+        return float(tx.get("amount") or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _dated_transactions(transactions: Iterable[Dict[str, Any]]) -> List[Tuple[date, Dict[str, Any]]]:
+    """Return (date, tx) pairs sorted by date, dropping rows without a valid date."""
+    dated = []
+    for tx in transactions:
+        tx_date = parse_transaction_date(tx.get("transaction_date"))
+        if tx_date is not None:
+            dated.append((tx_date, tx))
+    dated.sort(key=lambda pair: pair[0])
+    return dated
+
+
+def _classify_cadence(interval_days: float) -> Optional[str]:
+    for name, low, high in CADENCES:
+        if low <= interval_days <= high:
+            return name
+    return None
+
+
+def detect_recurring_payments(dated: List[Tuple[date, Dict[str, Any]]]) -> List[RecurringPayment]:
+    """Group by description and direction, keep groups with a stable cadence and amount."""
+    groups: Dict[Tuple[str, bool], List[Tuple[date, float, str]]] = defaultdict(list)
+    for tx_date, tx in dated:
+        description = (tx.get("description") or "").strip()
+        if not description:
+            continue
+        key = (description.lower(), bool(tx.get("positive")))
+        groups[key].append((tx_date, transaction_amount(tx), description))
+
+    recurring = []
+    for (_, positive), rows in groups.items():
+        if len(rows) < RECURRING_MIN_OCCURRENCES:
+            continue
+
+        intervals = [(rows[i][0] - rows[i - 1][0]).days for i in range(1, len(rows))]
+        interval = median(intervals)
+        cadence = _classify_cadence(interval)
+        if cadence is None:
+            continue
+
+        amounts = [amount for _, amount, _ in rows]
+        mean = sum(amounts) / len(amounts)
+        if mean <= 0:
+            continue
+        std = sqrt(sum((a - mean) ** 2 for a in amounts) / len(amounts))
+        if std / mean > RECURRING_MAX_AMOUNT_CV:
+            continue
+
+        last_date = rows[-1][0]
+        recurring.append(RecurringPayment(
+            description=rows[-1][2],
+            cadence=cadence,
+            occurrences=len(rows),
+            average_amount=round(mean, 2),
+            positive=positive,
+            last_date=last_date.isoformat(),
+            next_expected_date=(last_date + timedelta(days=round(interval))).isoformat(),
+        ))
+
+    recurring.sort(key=lambda r: r.average_amount, reverse=True)
+    return recurring
+
+
+def detect_spending_spikes(dated: List[Tuple[date, Dict[str, Any]]]) -> List[SpendingSpike]:
+    """Flag months whose outflow exceeds the rolling mean of the previous calendar months."""
+    monthly: Dict[Tuple[int, int], float] = defaultdict(float)
+    for tx_date, tx in dated:
+        if not tx.get("positive"):
+            monthly[(tx_date.year, tx_date.month)] += transaction_amount(tx)
+    if not monthly:
+        return []
+
+    # Walk every calendar month between the first and last, months without outflow count as 0
+    months = []
+    year, month = min(monthly)
+    last = max(monthly)
+    while (year, month) <= last:
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+    spikes = []
+    window: deque = deque(maxlen=SPIKE_BASELINE_MONTHS)
+    window_total = 0.0
+    for year, month in months:
+        total = monthly.get((year, month), 0.0)
+        if len(window) == SPIKE_BASELINE_MONTHS:
+            baseline = window_total / len(window)
+            if baseline > 0 and total > baseline * (1 + SPIKE_THRESHOLD):
+                spikes.append(SpendingSpike(
+                    month=f"{year:04d}-{month:02d}",
+                    total_spent=round(total, 2),
+                    baseline=round(baseline, 2),
+                    percent_change=round((total - baseline) / baseline * 100, 1),
+                ))
+            window_total -= window[0]
+        window.append(total)
+        window_total += total
+
+    return spikes
+
+
+def detect_outliers(dated: List[Tuple[date, Dict[str, Any]]]) -> List[TransactionOutlier]:
+    """Flag outflows far above the rolling mean of the previous outflows (z-score)."""
+    outliers = []
+    window: deque = deque(maxlen=OUTLIER_WINDOW)
+    running_sum = 0.0
+    running_sq = 0.0
+    for tx_date, tx in dated:
+        if tx.get("positive"):
+            continue
+        amount = transaction_amount(tx)
+
+        if len(window) >= OUTLIER_MIN_HISTORY:
+            n = len(window)
+            mean = running_sum / n
+            std = sqrt(max(running_sq / n - mean ** 2, 0.0))
+            if std > 0:
+                z_score = (amount - mean) / std
+                if z_score >= OUTLIER_Z_SCORE:
+                    outliers.append(TransactionOutlier(
+                        description=tx.get("description") or "",
+                        amount=round(amount, 2),
+                        transaction_date=tx_date.isoformat(),
+                        rolling_mean=round(mean, 2),
+                        z_score=round(z_score, 2),
+                    ))
+
+        if len(window) == OUTLIER_WINDOW:
+            oldest = window[0]
+            running_sum -= oldest
+            running_sq -= oldest ** 2
+        window.append(amount)
+        running_sum += amount
+        running_sq += amount ** 2
+
+    return outliers
+
+
+def build_insights(transactions: List[Dict[str, Any]]) -> InsightsResponse:
+    """
+    Deterministic analytics over a customer's transactions, O(n log n) in the number of rows:
+    - Recurring payments (same description with a stable amount and cadence)
+    - Month-over-month spending spikes
+    - Outlier transactions using rolling statistics
+    """
+    dated = _dated_transactions(transactions or [])
+    return InsightsResponse(
+        total_transactions=len(transactions or []),
+        recurring_payments=detect_recurring_payments(dated),
+        spending_spikes=detect_spending_spikes(dated),
+        outliers=detect_outliers(dated),
+    )
+
+
+def format_insights_for_prompt(insights: InsightsResponse) -> str:
+    """Render insights as plain text lines for the LLM prompt."""
+    lines = []
+    for r in insights.recurring_payments:
+        direction = "income" if r.positive else "expense"
+        lines.append(
+            f"- Recurring {direction}: {r.description}, {r.cadence}, ~{r.average_amount} "
+            f"({r.occurrences} times, next expected {r.next_expected_date})"
+        )
+    for s in insights.spending_spikes:
+        lines.append(
+            f"- Spending spike in {s.month}: {s.total_spent} vs baseline {s.baseline} (+{s.percent_change}%)"
+        )
+    for o in insights.outliers:
+        lines.append(
+            f"- Unusual transaction on {o.transaction_date}: {o.description}, {o.amount} "
+            f"(rolling mean {o.rolling_mean}, z={o.z_score})"
+        )
+    return "\n".join(lines) if lines else "- No recurring payments, spikes or outliers detected"
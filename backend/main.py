@@ -1,17 +1,50 @@
+import time
+_import_started = time.perf_counter()  # Measured by the /api/ready probe
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from routers import api_router
+from routers import api_router, mark_ready
 from api import router as nessie_router  # Importar el router de api.py
-import uvicorn
+from api import use_mock, USER_TYPE
+from config import settings
+from middleware import RateLimitMiddleware, RequestCoalescingMiddleware
+from contextlib import asynccontextmanager
+import threading
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm the analysis cache for the active mock profile without blocking startup
+    if settings.WARMUP_ON_STARTUP and use_mock:
+        from warmup import warmup_analysis_cache
+        threading.Thread(
+            target=warmup_analysis_cache,
+            args=([USER_TYPE], settings.WARMUP_QUERIES),
+            daemon=True,
+        ).start()
+    mark_ready((time.perf_counter() - _import_started) * 1000)
+    yield
 
 # Create FastAPI instance
 app = FastAPI(
     title="HackMIT 2025 Backend API",
     description="Backend API for HackMIT 2025 project",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
+# Admission control for upstream quotas (Nessie/Gemini). Added before CORS so it
+# runs inside it and 429 responses still carry CORS headers.
+if settings.COALESCE_GET_REQUESTS:
+    app.add_middleware(RequestCoalescingMiddleware)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(
+        RateLimitMiddleware,
+        limits=settings.RATE_LIMITS,
+        exempt=settings.RATE_LIMIT_EXEMPT,
+        trust_forwarded_for=settings.TRUST_FORWARDED_FOR,
+    )
+
 # Configure CORS - allow all origins for public API access
 allowed_origins = ["*"]  # Allow all origins for public API access
 
@@ -21,6 +54,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],
 )
 
 # Include routers (SOLO UNA VEZ CADA UNO)
@@ -33,4 +67,6 @@ async def root():
     return {"message": "Welcome to HackMIT 2025 Backend API"}
 
 if __name__ == "__main__":
+    import uvicorn  # Only needed when running this file directly
+
     uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
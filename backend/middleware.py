@@ -0,0 +1,145 @@
+import asyncio
+import json
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+
+# Idle buckets are evicted least-recently-used beyond this many (client, route) pairs
+MAX_BUCKETS = 10000
+
+
+class TokenBucketLimiter:
+    """
+    Token buckets keyed by (client, limit name). Each configured route has a
+    capacity (burst) and a refill rate in requests per minute; every other path
+    shares the client's single "default" bucket, so varying the path neither
+    yields fresh buckets nor churns the LRU.
+    """
+
+    def __init__(self, limits: Dict[str, Tuple[float, float]], max_buckets: int = MAX_BUCKETS):
+        self.limits = limits
+        self.max_buckets = max_buckets
+        self._buckets: "OrderedDict[Tuple[str, str], List[float]]" = OrderedDict()
+
+    def acquire(self, client: str, route: str, now: Optional[float] = None) -> float:
+        """Take one token; returns 0 if allowed, otherwise the seconds until a token is available."""
+        now = time.monotonic() if now is None else now
+        name = route if route in self.limits else "default"
+        per_minute, burst = self.limits[name]
+        rate = per_minute / 60.0
+        key = (client, name)
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [burst, now]
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            tokens, last = bucket
+            bucket[0] = min(burst, tokens + (now - last) * rate)
+            bucket[1] = now
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / rate if rate > 0 else float("inf")
+
+
+def _client_id(scope, trust_forwarded_for: bool) -> str:
+    if trust_forwarded_for:
+        for name, value in scope.get("headers", []):
+            if name == b"x-forwarded-for":
+                # Only the rightmost hop is added by the trusted proxy; the rest is client-supplied
+                hop = value.decode("latin-1").rsplit(",", 1)[-1].strip()
+                if hop:
+                    return hop
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class RateLimitMiddleware:
+    """ASGI middleware rejecting over-limit requests with 429 and a Retry-After header."""
+
+    def __init__(self, app, limits: Dict[str, Tuple[float, float]], exempt: List[str] = (),
+                 trust_forwarded_for: bool = False):
+        self.app = app
+        self.limiter = TokenBucketLimiter(limits)
+        self.exempt = set(exempt)
+        self.trust_forwarded_for = trust_forwarded_for
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or scope["path"] in self.exempt:
+            await self.app(scope, receive, send)
+            return
+
+        client = _client_id(scope, self.trust_forwarded_for)
+        wait = self.limiter.acquire(client, scope["path"])
+        if wait == 0:
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = str(max(1, math.ceil(wait))) if math.isfinite(wait) else "3600"
+        body = json.dumps({"detail": "Rate limit exceeded, retry later"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", retry_after.encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+class RequestCoalescingMiddleware:
+    """
+    ASGI middleware collapsing concurrent identical GET requests (same path and
+    query string) into one execution: the first request runs the app and the
+    others replay its buffered response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._in_flight: Dict[Tuple[str, bytes], asyncio.Future] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        key = (scope["path"], scope.get("query_string", b""))
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            try:
+                messages = await asyncio.shield(pending)
+            except Exception:
+                # The shared execution failed; run this request on its own
+                await self.app(scope, receive, send)
+                return
+            for message in messages:
+                await send(message)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        messages = []
+
+        async def send_and_record(message):
+            messages.append(message)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_record)
+        except BaseException as e:
+            future.set_exception(e if isinstance(e, Exception) else RuntimeError("Request cancelled"))
+            future.exception()  # Mark retrieved when nobody was waiting
+            raise
+        else:
+            future.set_result(messages)
+        finally:
+            del self._in_flight[key]
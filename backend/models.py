@@ -54,6 +54,12 @@ class HealthResponse(BaseModel):
     timestamp: datetime
     database_connected: bool
 
+class ReadinessResponse(BaseModel):
+    status: str
+    ready: bool
+    checks: Dict[str, bool]
+    startup_ms: Optional[float] = None  # From main.py import to the end of startup
+
 class EchoResponse(BaseModel):
     received_data: dict
     message: str
@@ -76,4 +82,43 @@ class Graph(GraphBase):
 class AgentAnalysisResponse(BaseModel):
     chart: Optional[Graph] = None  # Optional chart generation
     analysis: str  # LLM-style text analysis
-    userQuery: str  # The user's original query
\ No newline at end of file
+    userQuery: str  # The user's original query
+
+# Posted transaction record (only the fields the analytics use are kept)
+class TransactionRecord(BaseModel):
+    amount: Optional[float] = None
+    positive: bool = False
+    transaction_date: Optional[str] = None
+    description: Optional[str] = None  # Stored as "" when missing or null
+    type: Optional[str] = None
+    account_type: Optional[str] = None
+    nickname: Optional[str] = None
+
+# Insight models
+class RecurringPayment(BaseModel):
+    description: str
+    cadence: str  # weekly | biweekly | monthly
+    occurrences: int
+    average_amount: float
+    positive: bool  # True for recurring income
+    last_date: str
+    next_expected_date: str
+
+class SpendingSpike(BaseModel):
+    month: str  # YYYY-MM
+    total_spent: float
+    baseline: float  # Rolling mean of the previous months
+    percent_change: float
+
+class TransactionOutlier(BaseModel):
+    description: str
+    amount: float
+    transaction_date: str
+    rolling_mean: float
+    z_score: float
+
+class InsightsResponse(BaseModel):
+    total_transactions: int
+    recurring_payments: List[RecurringPayment] = []
+    spending_spikes: List[SpendingSpike] = []
+    outliers: List[TransactionOutlier] = []
@@ -1,20 +1,33 @@
-from fastapi import APIRouter, HTTPException, status, Query, UploadFile, File
+from fastapi import APIRouter, HTTPException, status, Query, UploadFile, File, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from typing import List, Dict, Any
 from models import (
-    BaseResponse, HealthResponse, EchoResponse, AgentAnalysisResponse
+    BaseResponse, HealthResponse, EchoResponse, AgentAnalysisResponse, InsightsResponse,
+    ReadinessResponse
 )
 from datetime import datetime
 import logging
 import base64
 import os
 from generate_new_graph import generate_financial_analysis
-import requests
+from insights import build_insights
+from api import get_transactions_for_customer, resolve_mock_path, use_mock, USER_TYPE
+from analysis_cache import CacheMissError, analysis_cache
+from config import settings
+from ingestion import ingest_transaction_payload
 
 logger = logging.getLogger(__name__)
 
 # Create router instances (SIN importar api_router de api.py para evitar conflictos)
 api_router = APIRouter(prefix="/api", tags=["API"])
 
+# Filled in by the startup event in main.py
+startup_state: Dict[str, Any] = {"ready": False, "startup_ms": None}
+
+def mark_ready(startup_ms: float) -> None:
+    startup_state["startup_ms"] = round(startup_ms, 1)
+    startup_state["ready"] = True
+
 # API Routes
 @api_router.get("/hello")
 async def hello_world():
@@ -36,8 +49,30 @@ async def health_check():
         database_connected=False
     )
 
+@api_router.get("/ready", response_model=ReadinessResponse)
+async def readiness_check(response: Response) -> ReadinessResponse:
+    """
+    Readiness probe for orchestrators, separate from the /health liveness check:
+    503 until startup has finished and the data the active mode needs is present.
+    """
+    checks = {"startup_complete": startup_state["ready"]}
+    if use_mock:
+        checks["mock_data"] = resolve_mock_path("data-transactions", f"{USER_TYPE}_transactions.json").exists()
+    if settings.ANALYSIS_BACKEND == "replay":
+        checks["analysis_cache"] = analysis_cache.exists(USER_TYPE)
+
+    ready = all(checks.values())
+    if not ready:
+        response.status_code = 503
+    return ReadinessResponse(
+        status="ready" if ready else ("not_ready" if startup_state["ready"] else "starting"),
+        ready=ready,
+        checks=checks,
+        startup_ms=startup_state["startup_ms"],
+    )
+
 @api_router.post("/generate-analysis", response_model=AgentAnalysisResponse)
-async def generate_financial_analysis_endpoint(request: Dict[str, Any]) -> AgentAnalysisResponse:
+async def generate_financial_analysis_endpoint(request: Request) -> AgentAnalysisResponse:
     """
     Generate a comprehensive financial analysis response that may include:
     - Optional chart generation with data
@@ -46,30 +81,57 @@ async def generate_financial_analysis_endpoint(request: Dict[str, Any]) -> Agent
 
     Body example:
     { "request": "analyze my spending patterns and show me where I can save money" }
+
+    An optional "transactions" list is parsed incrementally and bounded by
+    settings.MAX_BODY_BYTES / settings.MAX_TRANSACTIONS.
     """
-    user_request = request.get("request", "").strip()
+    payload = await ingest_transaction_payload(request)
+    user_request = payload.fields.get("request")
+    user_request = user_request.strip() if isinstance(user_request, str) else ""
     if not user_request:
         raise HTTPException(status_code=400, detail="Missing 'request' in body")
 
     # Fetch transaction data for analysis
-    transaction_data = request.get("transactions", [])  # Use provided data if available
+    transaction_data = payload.transactions  # Use provided data if available
     
-    # If no transaction data provided, fetch from backend
-    if not transaction_data:
+    # If no transaction data provided, load it directly (the replay backend needs none)
+    if not transaction_data and settings.ANALYSIS_BACKEND != "replay":
         try:
-            # Fetch REAL transaction data from backend
-            backend_response = requests.get("http://127.0.0.1:8000/api/transactions", timeout=10)
-            backend_response.raise_for_status()
-            backend_data = backend_response.json()
-            transaction_data = backend_data.get("transactions", [])
+            # Blocking (Nessie requests or file IO), so keep it off the event loop
+            transaction_data = (await run_in_threadpool(get_transactions_for_customer)).get("transactions", [])
         except Exception as e:
             print(f"Warning: Could not fetch real transaction data: {e}")
             transaction_data = []  # Fallback to empty if backend unavailable
 
-    # Call Google Gemini to obtain comprehensive analysis
+    # Call Google Gemini (or the warm cache) to obtain comprehensive analysis
     try:
         analysis_response: AgentAnalysisResponse = await generate_financial_analysis(user_request, transaction_data)
+    except CacheMissError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"LLM analysis failed: {e}")
 
-    return analysis_response
\ No newline at end of file
+    return analysis_response
+
+@api_router.get("/insights", response_model=InsightsResponse)
+async def get_insights() -> InsightsResponse:
+    """
+    Deterministic insights (recurring payments, spending spikes, outliers)
+    over the current customer's transactions, without any LLM call.
+    """
+    transaction_data = (await run_in_threadpool(get_transactions_for_customer)).get("transactions", [])
+    # CPU-bound over the whole history, so keep it off the event loop
+    return await run_in_threadpool(build_insights, transaction_data)
+
+@api_router.post("/insights", response_model=InsightsResponse)
+async def post_insights(request: Request) -> InsightsResponse:
+    """
+    Same as GET /api/insights but over the transactions posted by the client.
+
+    Body example:
+    { "transactions": [ { "amount": 120.0, "positive": false, "transaction_date": "2025-10-01", "description": "Gasolina" } ] }
+    """
+    payload = await ingest_transaction_payload(request)
+    if not payload.has_transactions:
+        raise HTTPException(status_code=400, detail="Missing 'transactions' list in body")
+    return await run_in_threadpool(build_insights, payload.transactions)
@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+import generate_new_graph
+import warmup
+from analysis_cache import AnalysisCache, CacheMissError
+from models import AgentAnalysisResponse
+
+
+def response(query):
+    return AgentAnalysisResponse(chart=None, analysis="Gastas mucho en restaurantes.", userQuery=query)
+
+
+def test_cache_round_trips_through_disk_with_normalized_queries(tmp_path):
+    cache = AnalysisCache(str(tmp_path))
+    cache.put("good", "Show me  my spending", response("Show me  my spending"))
+
+    reloaded = AnalysisCache(str(tmp_path))
+    hit = reloaded.get("good", "  show me my SPENDING ")
+    assert hit.analysis == "Gastas mucho en restaurantes."
+    assert hit.userQuery == "  show me my SPENDING "
+    assert reloaded.get("bad", "show me my spending") is None
+    assert reloaded.exists("good") and not reloaded.exists("bad")
+
+
+def test_replay_backend_raises_on_miss(tmp_path, monkeypatch):
+    monkeypatch.setattr(generate_new_graph, "analysis_cache", AnalysisCache(str(tmp_path)))
+    monkeypatch.setattr(generate_new_graph.settings, "ANALYSIS_BACKEND", "replay")
+
+    with pytest.raises(CacheMissError):
+        asyncio.run(generate_new_graph.generate_financial_analysis("unknown question"))
+
+
+def test_warmup_skips_missing_profiles_and_cached_queries(tmp_path, monkeypatch):
+    cache = AnalysisCache(str(tmp_path))
+    calls = []
+
+    def fake_call(prompt, query, transaction_data):
+        calls.append(query)
+        return response(query)
+
+    monkeypatch.setattr(warmup, "analysis_cache", cache)
+    monkeypatch.setattr(warmup, "call_gemini_analysis", fake_call)
+
+    assert warmup.warmup_analysis_cache(["missing", "good"], ["q1", "q2"]) == 2
+    assert warmup.warmup_analysis_cache(["good"], ["q1", "q2"]) == 0
+    assert calls == ["q1", "q2"]
+    assert cache.get("good", "q2").userQuery == "q2"
@@ -0,0 +1,94 @@
+import pytest
+
+from chart_engine import OTHER_LABEL, build_chart_data, categorize
+
+
+def tx(day, amount, description, positive=False, type_="purchase"):
+    return {"transaction_date": day, "amount": amount, "description": description, "positive": positive, "type": type_}
+
+
+TRANSACTIONS = [
+    tx("2025-01-03", 10000.0, "Depósito de nómina", positive=True, type_="deposit"),
+    tx("2025-01-05", 800.0, "Supermercado - Compra semanal"),
+    tx("2025-01-12", 200.0, "Supermercado orgánico"),
+    tx("2025-01-20", 500.0, "Gasolina"),
+    tx("2025-02-03", 10000.0, "Depósito de nómina", positive=True, type_="deposit"),
+    tx("2025-02-14", 1500.0, "Restaurante de Lujo"),
+]
+
+
+def test_categorize_ignores_accents_and_case():
+    assert categorize("Cafetería") == "Dining"
+    assert categorize("CAFETERIA") == "Dining"
+    assert categorize("Pago de electricidad") == "Housing & utilities"
+    assert categorize("Boletos de primera clase a Europa") == "Travel"
+    assert categorize("Algo desconocido") == OTHER_LABEL
+
+
+def test_default_pie_is_spending_by_category():
+    chart = build_chart_data("pie", TRANSACTIONS)
+
+    assert chart["xAxisKey"] == "name" and chart["yAxisKey"] == "value"
+    assert chart["data"] == [
+        {"name": "Dining", "value": 1500.0},
+        {"name": "Groceries", "value": 1000.0},
+        {"name": "Transport", "value": 500.0},
+    ]
+
+
+def test_monthly_net_flow_and_running_balance():
+    net = build_chart_data("line", TRANSACTIONS, group_by="month", metric="net_flow")
+    balance = build_chart_data("area", TRANSACTIONS, group_by="month", metric="balance")
+
+    assert net["data"] == [{"month": "2025-01", "amount": 8500.0}, {"month": "2025-02", "amount": 8500.0}]
+    assert balance["data"] == [{"month": "2025-01", "amount": 8500.0}, {"month": "2025-02", "amount": 17000.0}]
+
+
+def test_count_by_type_and_scatter_by_description():
+    assert build_chart_data("bar", TRANSACTIONS, group_by="type", metric="count")["data"] == [
+        {"type": "purchase", "count": 4},
+        {"type": "deposit", "count": 2},
+    ]
+    scatter = build_chart_data("scatter", TRANSACTIONS, group_by="description", metric="income")
+    assert scatter["data"] == [{"name": "Depósito de nómina", "x": 2, "y": 20000.0}]
+
+
+def test_small_groups_fold_into_other():
+    rows = [tx("2025-01-01", 100.0 - i, f"Comercio {i}") for i in range(15)]
+    data = build_chart_data("bar", rows, group_by="description")["data"]
+
+    assert len(data) == 10
+    assert data[-1]["description"] == OTHER_LABEL
+    assert sum(row["amount"] for row in data) == sum(100.0 - i for i in range(15))
+
+
+def test_category_falls_back_when_descriptions_are_not_recognized():
+    english = [
+        tx("2025-03-01", 60.0, "AMZN Mktp US"),
+        tx("2025-03-02", 40.0, "AMZN Mktp US"),
+        tx("2025-03-03", 30.0, "Shell Oil 5512"),
+        tx("2025-03-04", 20.0, "Gasolina"),
+    ]
+    assert build_chart_data("pie", english)["data"] == [
+        {"name": "AMZN Mktp US", "value": 100.0},
+        {"name": "Shell Oil 5512", "value": 30.0},
+        {"name": "Gasolina", "value": 20.0},
+    ]
+
+    blank = [tx("2025-03-01", 50.0, "", type_="p2p"), tx("2025-03-02", 25.0, "", type_="merchant")]
+    assert build_chart_data("pie", blank)["data"] == [
+        {"name": "p2p", "value": 50.0},
+        {"name": "merchant", "value": 25.0},
+    ]
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"chart_type": "radar"},
+    {"chart_type": "bar", "group_by": "weekday"},
+    {"chart_type": "bar", "metric": "profit"},
+    {"chart_type": "bar", "group_by": "category", "metric": "balance"},
+])
+def test_invalid_specs_raise(kwargs):
+    chart_type = kwargs.pop("chart_type")
+    with pytest.raises(ValueError):
+        build_chart_data(chart_type, TRANSACTIONS, **kwargs)
@@ -0,0 +1,105 @@
+import json
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+import ingestion
+from ingestion import PayloadTooLargeError, TransactionCollector, TransactionStreamParser
+from main import app
+
+
+def tx(i):
+    return {
+        "amount": round(i * 1.37 - 20, 2),
+        "positive": i % 3 == 0,
+        "transaction_date": f"2025-0{i % 9 + 1}-1{i % 10}",
+        "description": ["Uber", "OXXO", "Café \"Norte\"", "Renta\n"][i % 4],
+        "type": "purchase",
+    }
+
+
+def parse(chunks, max_transactions=1000):
+    collector = TransactionCollector(max_transactions)
+    parser = TransactionStreamParser(collector.add)
+    for chunk in chunks:
+        parser.feed(chunk)
+    parser.close()
+    return parser, collector
+
+
+def test_random_chunking_matches_json_loads():
+    body = {"request": "¿En qué gasto más?", "extra": {"n": [1, -0.5, 2e3]},
+            "transactions": [tx(i) for i in range(60)]}
+    text = json.dumps(body, ensure_ascii=False, indent=1)
+    rng = random.Random(7)
+    for _ in range(50):
+        cuts = sorted(rng.sample(range(1, len(text)), rng.randint(1, 40)))
+        chunks = [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+        parser, collector = parse(chunks)
+        assert parser.fields == {"request": body["request"], "extra": body["extra"]}
+        assert collector.transactions == body["transactions"]
+
+
+@pytest.mark.parametrize("number", ["-0.5", "12e-3", "100", "7.25E+2"])
+def test_numbers_split_at_every_position(number):
+    text = '{"transactions": [{"amount": %s}]}' % number
+    for cut in range(1, len(text)):
+        _, collector = parse([text[:cut], text[cut:]])
+        assert collector.transactions[0]["amount"] == float(number)
+
+
+@pytest.mark.parametrize("text", [
+    '{"transactions": [1, 2]}',
+    '{"transactions": {"amount": 1}}',
+    '{"transactions": [{"amount": 1}',
+    '{"transactions": [{"amount": 1},]}',
+    '{"request": "x"} trailing',
+    '[{"amount": 1}]',
+    '{1: 2}',
+])
+def test_malformed_bodies_raise(text):
+    with pytest.raises(ValueError):
+        parse([text])
+
+
+def test_null_description_is_stored_as_empty_string():
+    _, collector = parse(['{"transactions": [{"amount": 5, "description": null}]}'])
+    assert collector.transactions == [{"amount": 5.0, "positive": False, "description": ""}]
+
+
+def test_rows_are_compact_read_only_mappings():
+    _, collector = parse([json.dumps({"transactions": [tx(1)]})])
+    row = collector.transactions[0]
+
+    assert not hasattr(row, "__dict__")
+    assert row.get("nickname") is None and row.get("nickname", "n/a") == "n/a"
+    assert row.get("positive") is False and "nickname" not in row
+    assert json.loads(json.dumps(dict(row))) == tx(1)
+    with pytest.raises(KeyError):
+        row["account_type"]
+
+
+def test_null_transactions_counts_as_missing():
+    parser, _ = parse(['{"request": "x", "transactions": null}'])
+    assert not parser.has_transactions
+    parser, _ = parse(['{"transactions": []}'])
+    assert parser.has_transactions
+
+
+def test_transaction_limit_raises_payload_too_large():
+    with pytest.raises(PayloadTooLargeError):
+        parse([json.dumps({"transactions": [tx(i) for i in range(4)]})], max_transactions=3)
+
+
+def test_insights_endpoint_status_codes(monkeypatch):
+    client = TestClient(app)
+    assert client.post("/api/insights", json={"transactions": None}).status_code == 400
+    assert client.post("/api/insights", content=b'{"transactions": [').status_code == 400
+    assert client.post("/api/insights", json={"transactions": [{"amount": "abc"}]}).status_code == 422
+
+    ok = client.post("/api/insights", json={"transactions": [tx(i) for i in range(10)]})
+    assert ok.status_code == 200 and ok.json()["total_transactions"] == 10
+
+    monkeypatch.setattr(ingestion.settings, "MAX_BODY_BYTES", 64)
+    assert client.post("/api/insights", json={"transactions": [tx(i) for i in range(10)]}).status_code == 413
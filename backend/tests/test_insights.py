@@ -0,0 +1,82 @@
+from datetime import date, timedelta
+
+from insights import _dated_transactions, build_insights, detect_outliers, detect_spending_spikes
+
+
+def tx(day, amount, description="Compra", positive=False):
+    return {"transaction_date": day, "amount": amount, "description": description, "positive": positive}
+
+
+def test_detects_monthly_recurring_payment_with_next_date():
+    rows = [tx((date(2025, 1, 5) + timedelta(days=30 * i)).isoformat(), 499.0, "Netflix") for i in range(5)]
+    insights = build_insights(rows)
+
+    assert len(insights.recurring_payments) == 1
+    recurring = insights.recurring_payments[0]
+    assert recurring.cadence == "monthly"
+    assert recurring.occurrences == 5
+    assert recurring.average_amount == 499.0
+    assert recurring.last_date == "2025-05-05"
+    assert recurring.next_expected_date == "2025-06-04"
+
+
+def test_recurring_requires_stable_amount_and_cadence():
+    unstable_amount = [tx(f"2025-0{m}-05", amount, "Restaurante") for m, amount in zip(range(1, 5), [100, 900, 50, 600])]
+    irregular = [tx(day, 100.0, "Cine") for day in ("2025-01-01", "2025-01-03", "2025-03-20", "2025-07-01")]
+    too_few = [tx("2025-01-05", 10.0, "Gym"), tx("2025-02-05", 10.0, "Gym")]
+
+    assert build_insights(unstable_amount + irregular + too_few).recurring_payments == []
+
+
+def test_recurring_keeps_income_and_expenses_apart():
+    start = date(2025, 1, 1)
+    rows = []
+    for i in range(4):
+        day = (start + timedelta(days=14 * i)).isoformat()
+        rows.append(tx(day, 10000.0, "Transferencia", positive=True))
+        rows.append(tx(day, 300.0, "Transferencia"))
+    recurring = build_insights(rows).recurring_payments
+
+    assert {(r.positive, r.cadence) for r in recurring} == {(True, "biweekly"), (False, "biweekly")}
+
+
+def test_spike_against_rolling_baseline():
+    rows = [tx(f"2025-0{m}-10", 1000.0) for m in (1, 2, 3)] + [tx("2025-04-10", 2000.0)]
+    spikes = detect_spending_spikes(_dated_transactions(rows))
+
+    assert len(spikes) == 1
+    assert spikes[0].month == "2025-04"
+    assert spikes[0].baseline == 1000.0
+    assert spikes[0].percent_change == 100.0
+
+
+def test_spike_baseline_counts_months_without_spending_as_zero():
+    # Nov-Dec have no outflow, so February's baseline is (Nov 0 + Dec 0 + Jan 900) / 3,
+    # not the mean of the last three months with spending (Sep-Oct-Jan)
+    rows = [tx("2024-09-10", 3000.0), tx("2024-10-10", 3000.0), tx("2025-01-10", 900.0), tx("2025-02-10", 1000.0)]
+    spikes = detect_spending_spikes(_dated_transactions(rows))
+
+    assert [s.month for s in spikes] == ["2025-02"]
+    assert spikes[0].baseline == 300.0
+
+
+def test_outlier_uses_rolling_window_and_ignores_income():
+    rows = [tx(f"2025-01-{d:02d}", amount) for d, amount in zip(range(1, 9), [100, 120, 90, 110, 100, 95, 105, 100])]
+    rows.append(tx("2025-01-20", 50000.0, "Nómina", positive=True))
+    rows.append(tx("2025-01-21", 2000.0, "Televisión"))
+    outliers = detect_outliers(_dated_transactions(rows))
+
+    assert [o.description for o in outliers] == ["Televisión"]
+    assert outliers[0].rolling_mean == 102.5
+    assert outliers[0].z_score > 2.5
+
+
+def test_outliers_need_minimum_history():
+    rows = [tx("2025-01-01", 100.0), tx("2025-01-02", 100.0), tx("2025-01-03", 10000.0)]
+    assert detect_outliers(_dated_transactions(rows)) == []
+
+
+def test_rows_without_valid_dates_are_skipped():
+    insights = build_insights([tx(None, 100.0), tx("not-a-date", 100.0)])
+    assert insights.total_transactions == 2
+    assert insights.spending_spikes == [] and insights.outliers == []
@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+
+from config import parse_rate_limits
+from middleware import RateLimitMiddleware, RequestCoalescingMiddleware, TokenBucketLimiter
+
+
+def http_scope(path="/api/loans", method="GET", client="10.0.0.1", headers=()):
+    return {"type": "http", "method": method, "path": path, "query_string": b"",
+            "client": (client, 50000), "headers": list(headers)}
+
+
+async def call(app, scope):
+    """Run an ASGI app once; returns (status, headers dict, body)."""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages[0]["status"], dict(messages[0]["headers"]), messages[1]["body"]
+
+
+def ok_app(body=b"ok", calls=None, delay=0.0):
+    async def app(scope, receive, send):
+        if calls is not None:
+            calls.append(scope["path"])
+        await asyncio.sleep(delay)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": body})
+    return app
+
+
+def test_rate_limits_parse_merges_default_and_rejects_bad_entries():
+    assert parse_rate_limits("/api/x=10/3") == {"default": (120.0, 30.0), "/api/x": (10.0, 3.0)}
+    assert parse_rate_limits("default=60/5")["default"] == (60.0, 5.0)
+    for bad in ["x=10", "/api/x=1/2/3", "/api/x", "=1/2", "/api/x=0/1", "/api/x=nan/1", "/api/x=6/0"]:
+        with pytest.raises(ValueError):
+            parse_rate_limits(bad)
+
+
+def test_token_bucket_burst_then_refill():
+    limiter = TokenBucketLimiter({"default": (60.0, 3.0), "/slow": (6.0, 1.0)})
+
+    assert [limiter.acquire("a", "/x", now=0.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.acquire("a", "/x", now=0.0) == pytest.approx(1.0)   # 1 token/second
+    assert limiter.acquire("a", "/x", now=0.5) == pytest.approx(0.5)   # half a token refilled
+    assert limiter.acquire("a", "/x", now=1.0) == 0.0
+    assert limiter.acquire("b", "/x", now=1.0) == 0.0                   # buckets are per client
+
+    assert limiter.acquire("a", "/slow", now=0.0) == 0.0
+    assert limiter.acquire("a", "/slow", now=2.0) == pytest.approx(8.0)
+    # Refill is capped at the burst size
+    assert [limiter.acquire("a", "/slow", now=1000.0) for _ in range(2)] == [0.0, pytest.approx(10.0)]
+
+
+def test_unlisted_paths_share_the_default_bucket():
+    limiter = TokenBucketLimiter({"default": (60.0, 2.0), "/api/generate-analysis": (6.0, 1.0)}, max_buckets=3)
+
+    assert limiter.acquire("a", "/api/generate-analysis", now=0.0) == 0.0
+    assert [limiter.acquire("a", f"/junk/{i}", now=0.0) for i in range(3)] == [0.0, 0.0, pytest.approx(1.0)]
+    # Junk paths did not evict the drained analysis bucket or create new ones
+    assert limiter.acquire("a", "/api/generate-analysis", now=0.0) == pytest.approx(10.0)
+    assert len(limiter._buckets) == 2
+
+
+def test_token_bucket_evicts_least_recently_used():
+    limiter = TokenBucketLimiter({"default": (60.0, 1.0)}, max_buckets=2)
+    limiter.acquire("a", "/x", now=0.0)
+    limiter.acquire("b", "/x", now=0.0)
+    limiter.acquire("a", "/x", now=0.0)
+    limiter.acquire("c", "/x", now=0.0)  # evicts "b", the least recently used
+    assert limiter.acquire("a", "/x", now=0.0) > 0    # still tracked, still empty
+    assert limiter.acquire("b", "/x", now=0.0) == 0.0  # starts over with a full bucket
+
+
+def test_rate_limit_middleware_returns_429_with_retry_after():
+    app = RateLimitMiddleware(ok_app(), limits={"default": (60.0, 10.0), "/api/loans": (12.0, 1.0)},
+                              exempt=["/api/health"], trust_forwarded_for=True)
+
+    async def scenario():
+        first = await call(app, http_scope())
+        limited = await call(app, http_scope())
+        other_client = await call(app, http_scope(headers=[(b"x-forwarded-for", b"10.0.0.1, 1.2.3.4")]))
+        exempt = [await call(app, http_scope("/api/health")) for _ in range(20)]
+        return first, limited, other_client, exempt
+
+    first, limited, other_client, exempt = asyncio.run(scenario())
+    assert first[0] == 200
+    assert limited[0] == 429
+    assert limited[1][b"retry-after"] == b"5"  # one token every 5 seconds at 12/min
+    assert other_client[0] == 200
+    assert all(status == 200 for status, _, _ in exempt)
+
+
+def test_client_supplied_forwarded_for_entries_do_not_change_the_bucket():
+    app = RateLimitMiddleware(ok_app(), limits={"default": (60.0, 1.0)}, trust_forwarded_for=True)
+
+    async def scenario():
+        # The trusted proxy appended 9.9.9.9; everything to its left came from the client
+        spoofed = [b"1.1.1.1, 9.9.9.9", b"2.2.2.2,9.9.9.9", b"9.9.9.9"]
+        return [await call(app, http_scope(headers=[(b"x-forwarded-for", value)])) for value in spoofed]
+
+    statuses = [status for status, _, _ in asyncio.run(scenario())]
+    assert statuses == [200, 429, 429]
+
+
+def test_coalescing_runs_concurrent_identical_gets_once():
+    calls = []
+    app = RequestCoalescingMiddleware(ok_app(b"shared", calls, delay=0.05))
+
+    async def scenario():
+        same = await asyncio.gather(*(call(app, http_scope()) for _ in range(10)))
+        await call(app, http_scope())  # not concurrent, runs again
+        await call(app, http_scope(method="POST"))
+        return same
+
+    same = asyncio.run(scenario())
+    assert [body for _, _, body in same] == [b"shared"] * 10
+    assert calls == ["/api/loans"] * 3
+
+
+def test_coalescing_followers_fall_back_when_leader_fails():
+    calls = []
+
+    async def flaky_app(scope, receive, send):
+        calls.append(scope["path"])
+        await asyncio.sleep(0.05)
+        if len(calls) == 1:
+            raise RuntimeError("upstream down")
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"retried"})
+
+    app = RequestCoalescingMiddleware(flaky_app)
+
+    async def scenario():
+        return await asyncio.gather(*(call(app, http_scope()) for _ in range(4)), return_exceptions=True)
+
+    leader, *followers = asyncio.run(scenario())
+    assert isinstance(leader, RuntimeError)
+    assert [body for _, _, body in followers] == [b"retried"] * 3
+    assert len(calls) == 4
+    assert app._in_flight == {}
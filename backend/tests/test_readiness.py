@@ -0,0 +1,29 @@
+from fastapi.testclient import TestClient
+
+import api
+import routers
+from analysis_cache import AnalysisCache
+from main import app
+
+
+def test_mock_lookup_falls_back_to_parent_directory(tmp_path, monkeypatch):
+    backend = tmp_path / "backend"
+    backend.mkdir()
+    (tmp_path / "data-transactions").mkdir()
+    (tmp_path / "data-transactions" / "good_transactions.json").write_text('{"transactions": []}')
+    monkeypatch.setattr(api, "__file__", str(backend / "api.py"))
+
+    assert api.resolve_mock_path("data-transactions", "good_transactions.json").exists()
+    assert api.load_mock_json("data-transactions", "good_transactions.json") == {"transactions": []}
+
+
+def test_ready_reports_not_ready_when_replay_cache_is_missing(tmp_path, monkeypatch):
+    monkeypatch.setattr(routers, "use_mock", False)
+    monkeypatch.setattr(routers.settings, "ANALYSIS_BACKEND", "replay")
+    monkeypatch.setattr(routers, "analysis_cache", AnalysisCache(str(tmp_path)))
+
+    with TestClient(app) as client:
+        response = client.get("/api/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "not_ready"
+    assert response.json()["checks"] == {"startup_complete": True, "analysis_cache": False}
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Precompute analysis responses for the mock profiles so the analysis endpoint can
+serve them from the warm cache (ANALYSIS_BACKEND=cached) or fully offline
+(ANALYSIS_BACKEND=replay).
+
+Usage:
+    python warmup.py                               # settings.WARMUP_PROFILES x settings.WARMUP_QUERIES
+    python warmup.py --profiles good --queries "how can I improve my credit score"
+    python warmup.py --force                       # recompute entries that already exist
+"""
+import argparse
+import logging
+from typing import List
+
+from fastapi import HTTPException
+
+from analysis_cache import analysis_cache
+from api import load_mock_json
+from config import settings
+from generate_new_graph import _build_analysis_prompt, call_gemini_analysis
+
+logger = logging.getLogger(__name__)
+
+
+def warmup_analysis_cache(profiles: List[str], queries: List[str], force: bool = False) -> int:
+    """Run the live analysis for every (profile, query) pair missing from the cache."""
+    computed = 0
+    for profile in profiles:
+        try:
+            transaction_data = load_mock_json("data-transactions", f"{profile}_transactions.json").get("transactions", [])
+        except HTTPException as e:
+            logger.warning("Warmup skipped profile '%s': %s", profile, e.detail)
+            continue
+        for query in queries:
+            if not force and analysis_cache.contains(profile, query):
+                continue
+            try:
+                prompt = _build_analysis_prompt(query, transaction_data)
+                response = call_gemini_analysis(prompt, query, transaction_data)
+            except Exception as e:
+                logger.warning("Warmup failed for profile '%s' and query '%s': %s", profile, query, e)
+                continue
+            analysis_cache.put(profile, query, response)
+            computed += 1
+    return computed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm the analysis cache for the mock profiles")
+    parser.add_argument("--profiles", nargs="+", default=settings.WARMUP_PROFILES)
+    parser.add_argument("--queries", nargs="+", default=settings.WARMUP_QUERIES)
+    parser.add_argument("--force", action="store_true", help="Recompute cached entries")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    count = warmup_analysis_cache(args.profiles, args.queries, force=args.force)
+    print(f"Warmed {count} analysis responses into {settings.ANALYSIS_CACHE_DIR}")
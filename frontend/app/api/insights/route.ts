@@ -1,4 +1,5 @@
 import { NextResponse } from 'next/server'
+import { forwardedForHeaders } from '@/lib/utils'
 
 export async function POST(request: Request) {
   try {
@@ -17,6 +18,7 @@ export async function POST(request: Request) {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
+        ...forwardedForHeaders(request),
       },
       body: JSON.stringify({
         request: question,
@@ -1,8 +1,11 @@
 import { NextRequest, NextResponse } from "next/server";
+import { forwardedForHeaders } from "@/lib/utils";
 
 export async function GET(request: NextRequest) {
   try {
-    const res = await fetch(`http://127.0.0.1:8000/api/loans-credit-summary`);
+    const res = await fetch(`http://127.0.0.1:8000/api/loans-credit-summary`, {
+      headers: forwardedForHeaders(request),
+    });
     
     if (!res.ok) {
       const errorText = await res.text();
@@ -1,8 +1,11 @@
 import { NextRequest, NextResponse } from "next/server";
+import { forwardedForHeaders } from "@/lib/utils";
 
 export async function GET(request: NextRequest) {
   try {
-    const res = await fetch(`http://127.0.0.1:8000/api/transactions`);
+    const res = await fetch(`http://127.0.0.1:8000/api/transactions`, {
+      headers: forwardedForHeaders(request),
+    });
     
     const text = await res.text();
     console.log("FastAPI Response Status:", res.status);
@@ -12,3 +12,17 @@ export function formatDate(dateString: string): string {
   const year = String(date.getFullYear()).slice(-2);
   return `${month}-${day}-${year}`;
 }
+
+// Pass the address of the peer this server sees on to the backend, so its rate
+// limiter (with TRUST_FORWARDED_FOR=true) keeps one bucket per client instead of
+// one for this proxy. Only the rightmost X-Forwarded-For hop is used: it is the
+// one added by the reverse proxy in front of Next (or by Next itself from the
+// socket). Entries to its left come from the client and are never forwarded.
+export function forwardedForHeaders(request: Request): Record<string, string> {
+  const hops = (request.headers.get("x-forwarded-for") ?? "")
+    .split(",")
+    .map((hop) => hop.trim())
+    .filter(Boolean);
+  const peer = hops[hops.length - 1];
+  return peer ? { "X-Forwarded-For": peer } : {};
+}